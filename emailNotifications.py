@@ -1,132 +1,115 @@
 import os
-import re
+import atexit
 import pathlib
 import smtplib
+from dataclasses import dataclass
 from email.mime.text import MIMEText
-from typing import Optional
-import requests
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+from price_core import CONFIG, Notifier, format_price, run
 
-# Load environment variables from .env
-load_dotenv()
 
-APARTMENT_URL = os.getenv("APARTMENT_URL")
-PRICE_THRESHOLD = float(os.getenv("PRICE_THRESHOLD", "999999"))
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    smtp_server: str
+    smtp_port: int
+    email_from: str
+    email_to: str
+    username: str
+    password: str
 
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-EMAIL_FROM = os.getenv("EMAIL_FROM")
-EMAIL_TO = os.getenv("EMAIL_TO")
-EMAIL_USERNAME = os.getenv("EMAIL_USERNAME") or EMAIL_FROM
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+    def __post_init__(self):
+        if not all([self.smtp_server, self.smtp_port, self.email_from, self.email_to, self.username, self.password]):
+            raise SystemExit("Email settings are incomplete. Check your .env file.")
 
-# Separate state file so it does not collide with the SMS-based script
-LAST_PRICE_FILE = pathlib.Path("last_notified_price_email.txt")
-
-
-def get_current_price() -> float:
-    """
-    Fetch price from:
-    <span data-jd-fp-adp="display" class="jd-fp-strong-text">Base Rent $2,671</span>
-    """
-    if not APARTMENT_URL:
-        raise RuntimeError("APARTMENT_URL is not set. Check your .env file.")
-
-    resp = requests.get(APARTMENT_URL, timeout=15)
-    resp.raise_for_status()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    span = soup.select_one('span[data-jd-fp-adp="display"].jd-fp-strong-text')
-    if not span or not span.get_text(strip=True):
-        raise ValueError(
-            'Price element not found with selector '
-            'span[data-jd-fp-adp="display"].jd-fp-strong-text'
-        )
 
-    text = span.get_text(strip=True)  # e.g. "Base Rent $2,671"
+EMAIL_CONFIG = EmailConfig(
+    smtp_server=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+    smtp_port=int(os.getenv("SMTP_PORT", "587")),
+    email_from=os.getenv("EMAIL_FROM"),
+    email_to=os.getenv("EMAIL_TO"),
+    username=os.getenv("EMAIL_USERNAME") or os.getenv("EMAIL_FROM"),
+    password=os.getenv("EMAIL_PASSWORD"),
+)
 
-    match = re.search(r"\$\s*([0-9]{1,3}(?:,[0-9]{3})*)", text)
-    if not match:
-        raise ValueError(f"Could not parse price from: {text!r}")
+# Separate state file so it does not collide with the SMS notifier
+LAST_PRICE_FILE = pathlib.Path("last_notified_price_email.txt")
 
-    price_str = match.group(1).replace(",", "")
-    return float(price_str)
+# Logged-in SMTP connection, kept open between alerts while the process is alive
+_SMTP = {"server": None}
+# Seconds before an SMTP call gives up. The cached connection can sit idle for hours and be
+# dropped half-open by a NAT or firewall; without this the NOOP probe would hang the poll loop.
+SMTP_TIMEOUT = 15
 
 
 def send_email(subject: str, body: str) -> None:
     """
     Send an email using the configured SMTP server.
     """
-    if not all([SMTP_SERVER, SMTP_PORT, EMAIL_FROM, EMAIL_TO, EMAIL_USERNAME, EMAIL_PASSWORD]):
-        raise RuntimeError("Email settings are incomplete. Check your .env file.")
-
     msg = MIMEText(body)
     msg["Subject"] = subject
-    msg["From"] = EMAIL_FROM
-    msg["To"] = EMAIL_TO
-
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        server.starttls()
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.send_message(msg)
+    msg["From"] = EMAIL_CONFIG.email_from
+    msg["To"] = EMAIL_CONFIG.email_to
 
-
-def get_last_notified_price() -> Optional[float]:
-    if not LAST_PRICE_FILE.exists():
-        return None
     try:
-        content = LAST_PRICE_FILE.read_text().strip()
-        return float(content)
+        _get_smtp().send_message(msg)
+    except smtplib.SMTPServerDisconnected:
+        # The server dropped us after the keepalive probe; reconnect once and retry
+        _close_smtp()
+        _get_smtp().send_message(msg)
+
+
+def _get_smtp() -> smtplib.SMTP:
+    server = _SMTP["server"]
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _close_smtp()
+
+    server = smtplib.SMTP(EMAIL_CONFIG.smtp_server, EMAIL_CONFIG.smtp_port, timeout=SMTP_TIMEOUT)
+    try:
+        server.starttls()
+        server.login(EMAIL_CONFIG.username, EMAIL_CONFIG.password)
     except Exception:
-        return None
+        server.close()
+        raise
+    _SMTP["server"] = server
+    return server
 
 
-def set_last_notified_price(price: float) -> None:
-    LAST_PRICE_FILE.write_text(str(price))
-
-
-def main():
-    try:
-        current_price = get_current_price()
-    except Exception as e:
-        print(f"Error fetching/parsing price: {e}")
+def _close_smtp() -> None:
+    server, _SMTP["server"] = _SMTP["server"], None
+    if server is None:
         return
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
 
-    print(f"Current price: {current_price}")
-
-    if current_price > PRICE_THRESHOLD:
-        print(f"Price is above threshold ({PRICE_THRESHOLD}). No email sent.")
-        return
 
-    last_price = get_last_notified_price()
+atexit.register(_close_smtp)
 
-    # Only notify if:
-    #  - we never notified before, or
-    #  - the current price is different (usually lower) than last notified
-    if last_price is not None and current_price >= last_price:
-        print(
-            f"Price {current_price} is not lower than last notified price {last_price}. "
-            f"No email sent."
-        )
-        return
 
+def notify_email(current_price: int) -> None:
     subject = "Apartment price alert"
     body = (
         f"Apartment price alert!\n\n"
-        f"Current quote: ${current_price:,.0f}\n"
-        f"Threshold: ${PRICE_THRESHOLD:,.0f}\n"
-        f"URL: {APARTMENT_URL}\n"
+        f"Current quote: {format_price(current_price)}\n"
+        f"Threshold: {format_price(CONFIG.price_threshold)}\n"
+        f"URL: {CONFIG.apartment_url}\n"
     )
 
     print("Sending email...")
-    try:
-        send_email(subject, body)
-        set_last_notified_price(current_price)
-        print("Email sent.")
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+    send_email(subject, body)
+    print("Email sent.")
+
+
+NOTIFIER = Notifier(notify_email, LAST_PRICE_FILE, "email")
+
+
+def main():
+    run([NOTIFIER])
 
 
 if __name__ == "__main__":
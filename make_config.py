@@ -0,0 +1,44 @@
+"""
+Bake .env into baked_env.py so the checkers can skip parsing .env on every start.
+
+Run this once at deploy time, and again whenever .env changes:
+
+    python make_config.py
+
+While baked_env.py exists it takes the place of .env; delete it to go back to
+reading .env directly. Real environment variables still win over both.
+
+baked_env.py holds every secret from .env (EMAIL_PASSWORD, TWILIO_AUTH_TOKEN, ...)
+and is written readable by its owner only. Once imported, Python also caches it
+as __pycache__/baked_env.*.pyc with the same secrets (and the same mode); delete
+that along with baked_env.py.
+"""
+import os
+import pathlib
+import pprint
+from dotenv import dotenv_values
+
+ENV_FILE = pathlib.Path(__file__).with_name(".env")
+BAKED_ENV_FILE = pathlib.Path(__file__).with_name("baked_env.py")
+
+
+def main():
+    if not ENV_FILE.exists():
+        raise SystemExit(f"{ENV_FILE} not found.")
+
+    env = {key: value for key, value in dotenv_values(ENV_FILE).items() if value is not None}
+    source = (
+        "# Generated by make_config.py from .env. Do not edit; rerun make_config.py instead.\n"
+        f"ENV = {pprint.pformat(env)}\n"
+    )
+
+    # Create it owner-only from the start, and tighten an existing file that predates this
+    fd = os.open(BAKED_ENV_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(source)
+    print(f"Wrote {len(env)} settings to {BAKED_ENV_FILE}")
+
+
+if __name__ == "__main__":
+    main()
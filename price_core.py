@@ -0,0 +1,355 @@
+import os
+import atexit
+import json
+import re
+import pathlib
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    # Baked from .env by make_config.py, so cold starts skip importing dotenv and parsing .env
+    from baked_env import ENV as _BAKED_ENV
+except ImportError:
+    from dotenv import load_dotenv
+
+    # Load .env config
+    load_dotenv()
+else:
+    for _key, _value in _BAKED_ENV.items():
+        os.environ.setdefault(_key, _value)
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    apartment_url: str
+    # Prices are handled as integer cents; the env value is in dollars
+    price_threshold: int
+    # Seconds between checks. 0 runs a single check and exits, for cron.
+    poll_interval: int
+    # Adaptive backoff: the delay doubles from poll_min up to poll_max while the price
+    # stays the same. Under cron, set POLL_MIN to the cron period so runs that fall
+    # inside the backoff window exit without fetching.
+    poll_min: int
+    poll_max: int
+
+    def __post_init__(self):
+        if not self.apartment_url:
+            raise SystemExit("APARTMENT_URL is not set. Check your .env file.")
+        if self.poll_interval < 0 or self.poll_min < 0:
+            raise SystemExit("POLL_INTERVAL and POLL_MIN must not be negative. Check your .env file.")
+        if self.poll_max < self.poll_min:
+            raise SystemExit("POLL_MAX must not be less than POLL_MIN. Check your .env file.")
+
+
+def _load_config() -> Config:
+    poll_interval = int(os.getenv("POLL_INTERVAL", "0"))
+    poll_min = int(os.getenv("POLL_MIN") or poll_interval)
+    return Config(
+        apartment_url=os.getenv("APARTMENT_URL"),
+        price_threshold=round(float(os.getenv("PRICE_THRESHOLD", "999999")) * 100),
+        poll_interval=poll_interval,
+        poll_min=poll_min,
+        poll_max=int(os.getenv("POLL_MAX") or poll_min),
+    )
+
+
+CONFIG = _load_config()
+
+# ETag / Last-Modified of the last full fetch, plus the price parsed from it
+HTTP_CACHE_FILE = pathlib.Path("price_cache.json")
+
+# In-memory copy of each notifier's last-price file so polling does not re-read it every cycle.
+# The file's (mtime_ns, size) is kept alongside so edits made outside the process are picked up.
+_STATE = {}
+
+# One client for the whole process so repeated polls reuse the TCP+TLS connection and
+# SSL context; HTTP/2 lets requests to the same host share that one connection
+CLIENT = httpx.Client(
+    http2=True,
+    timeout=15,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+    headers={"User-Agent": "ApartmentPriceChecker/1.0"},
+)
+atexit.register(CLIENT.close)
+
+STREAM_CHUNK_SIZE = 8192
+# Give up on the fast path and read the whole page for the DOM parser past this many bytes
+STREAM_SCAN_LIMIT = 256 * 1024
+# CSS selector for the price span, used when the bytes regex misses
+PRICE_SELECTOR = 'span.jd-fp-strong-text[data-jd-fp-adp="display"]'
+# Matches the amount inside the price span directly in the raw response bytes. The
+# lookaheads require both the class and data-jd-fp-adp="display" on the same <span>
+# tag, in either order, so this picks the same element as PRICE_SELECTOR.
+PRICE_SPAN_RE = re.compile(
+    rb"<span"
+    rb"(?=[^>]*\sdata-jd-fp-adp=[\"']?display(?![\w-]))"
+    rb"(?=[^>]*\sclass=[\"']?[^\"'>]*(?<![\w-])jd-fp-strong-text(?![\w-]))"
+    rb"[^>]*>[^<$]*\$\s*([0-9]{1,3}(?:,[0-9]{3})*)"
+)
+# Matches the amount in the span's text, e.g. "Base Rent $2,671"
+PRICE_TEXT_RE = re.compile(r"\$\s*([0-9]{1,3}(?:,[0-9]{3})*)")
+
+
+def get_current_price() -> int:
+    """
+    Fetch price in cents from:
+    <span data-jd-fp-adp="display" class="jd-fp-strong-text">Base Rent $2,671</span>
+    """
+    cache = load_http_cache()
+    headers = {}
+    if cache.get("url") == CONFIG.apartment_url and "price_cents" in cache:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+    with CLIENT.stream("GET", CONFIG.apartment_url, headers=headers) as resp:
+        if resp.status_code == 304:
+            # Page unchanged since the last full fetch, no need to parse it again
+            return cache["price_cents"]
+        resp.raise_for_status()
+
+        # Fast path: scan the raw bytes as they arrive and stop downloading once
+        # the price span has gone past, without building a DOM
+        buf = bytearray()
+        match = None
+        chunks = resp.iter_bytes(STREAM_CHUNK_SIZE)
+        for chunk in chunks:
+            buf += chunk
+            match = PRICE_SPAN_RE.search(buf)
+            if match and amount_is_complete(buf, match.end()):
+                break
+            if len(buf) >= STREAM_SCAN_LIMIT:
+                # No complete amount in the first part of the page; leave it to the DOM parser
+                match = None
+                break
+
+        if match:
+            price = int(match.group(1).replace(b",", b"")) * 100
+        else:
+            # Drain whatever is left of the same iterator (a second iter_bytes() call
+            # raises once the body has been read to the end)
+            for chunk in chunks:
+                buf += chunk
+            # Only the ASCII price matters, so decode as UTF-8 rather than trusting
+            # (or sniffing for) the declared charset
+            price_str = parse_price_from_html(buf.decode("utf-8", errors="replace"))
+            price = int(price_str.replace(",", "")) * 100
+
+    save_http_cache({
+        "url": CONFIG.apartment_url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "price_cents": price,
+    })
+    return price
+
+
+def amount_is_complete(buf: bytes, end: int) -> bool:
+    """
+    True if the amount PRICE_SPAN_RE matched up to buf[end] cannot grow any
+    further: the next byte has arrived and is not another digit or comma.
+    A chunk that stops at "$2," or "$2,67" would otherwise read as $2.
+    """
+    return end < len(buf) and buf[end] not in b"0123456789,"
+
+
+def parse_price_from_html(html: str) -> str:
+    """
+    Slow path for get_current_price(): locate the price span in the parsed DOM
+    and return the amount as written, e.g. "2,671".
+    """
+    tree = LexborHTMLParser(html)
+
+    span = tree.css_first(PRICE_SELECTOR)
+    if not span or not span.text(strip=True):
+        raise ValueError(f"Price element not found with selector {PRICE_SELECTOR}")
+
+    text = span.text(strip=True)  # e.g. "Base Rent $2,671"
+
+    match = PRICE_TEXT_RE.search(text)
+    if not match:
+        raise ValueError(f"Could not parse price from: {text!r}")
+    return match.group(1)
+
+
+def load_http_cache() -> dict:
+    try:
+        return json.loads(HTTP_CACHE_FILE.read_text())
+    except Exception:
+        return {}
+
+
+def save_http_cache(cache: dict) -> None:
+    HTTP_CACHE_FILE.write_text(json.dumps(cache))
+
+
+def format_price(cents: int) -> str:
+    return f"${cents / 100:,.0f}"
+
+
+def read_last_notified_price(path: pathlib.Path) -> Optional[int]:
+    if not path.exists():
+        return None
+    try:
+        content = path.read_text().strip()
+        if "." in content:
+            # Written by an older version, in dollars
+            return round(float(content) * 100)
+        return int(content)
+    except Exception:
+        return None
+
+
+def _file_key(path: pathlib.Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_last_notified_price(path: pathlib.Path) -> Optional[int]:
+    state = _STATE.get(path)
+    key = _file_key(path)
+    if state is None or key != state["key"]:
+        # First read, or the file was changed or removed since we last saw it
+        state = _STATE[path] = {"last": read_last_notified_price(path), "key": key}
+    return state["last"]
+
+
+def set_last_notified_price(path: pathlib.Path, price: int) -> None:
+    # Write through right away so a crash cannot lose it; skip the write if nothing changed
+    if price == get_last_notified_price(path):
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(str(price))
+    os.replace(tmp, path)
+    _STATE[path] = {"last": price, "key": _file_key(path)}
+
+
+@dataclass(frozen=True, slots=True)
+class Notifier:
+    # Called with the price in cents when an alert should go out
+    send: Callable[[int], None]
+    # Each notifier remembers its own last alerted price
+    last_price_file: pathlib.Path
+    # Used in log lines, e.g. "No SMS sent."
+    channel: str
+
+
+def poll_state_file(notifiers: Sequence[Notifier]) -> pathlib.Path:
+    """
+    Where to keep the last observed price, how many polls in a row it has not
+    changed, and when to poll next. Each set of channels gets its own file so
+    separately scheduled scripts do not skip each other's polls.
+    """
+    channels = "_".join(sorted(n.channel.lower() for n in notifiers))
+    return pathlib.Path(f"poll_state_{channels}.json")
+
+
+def load_poll_state(path: pathlib.Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except Exception:
+        return {}
+
+
+def save_poll_state(path: pathlib.Path, state: dict) -> None:
+    path.write_text(json.dumps(state))
+
+
+def next_poll_delay(unchanged_streak: int) -> int:
+    # Cap the exponent; past this the delay is pinned at POLL_MAX anyway
+    return min(CONFIG.poll_max, CONFIG.poll_min * 2 ** min(unchanged_streak, 32))
+
+
+def check_and_notify(notifiers: Sequence[Notifier]) -> Optional[int]:
+    """
+    Fetch the current price once and, for each notifier, send an alert if it is
+    under the threshold and lower than the last price that notifier was sent.
+    Returns the price, or None if it could not be fetched.
+    """
+    try:
+        current_price = get_current_price()
+    except Exception as e:
+        # If the site breaks or parsing fails, just print error and exit quietly.
+        print(f"Error fetching/parsing price: {e}")
+        return None
+
+    print(f"Current price: {format_price(current_price)}")
+
+    if current_price > CONFIG.price_threshold:
+        channels = " or ".join(n.channel for n in notifiers)
+        print(f"Price is above threshold ({format_price(CONFIG.price_threshold)}). No {channels} sent.")
+        return current_price
+
+    for notifier in notifiers:
+        last_price = get_last_notified_price(notifier.last_price_file)
+
+        # Only notify if:
+        #  - we never notified before, or
+        #  - the current price is different (usually lower) than last notified
+        if last_price is not None and current_price >= last_price:
+            print(
+                f"Price {format_price(current_price)} is not lower than last notified price "
+                f"{format_price(last_price)}. No {notifier.channel} sent."
+            )
+            continue
+
+        try:
+            notifier.send(current_price)
+            set_last_notified_price(notifier.last_price_file, current_price)
+        except Exception as e:
+            print(f"Failed to send {notifier.channel}: {e}")
+    return current_price
+
+
+def poll(notifiers: Sequence[Notifier]) -> float:
+    """
+    Run check_and_notify() unless the backoff window from earlier unchanged
+    polls is still open. Returns the number of seconds until the next poll.
+    """
+    if CONFIG.poll_min <= 0:
+        check_and_notify(notifiers)
+        return CONFIG.poll_interval
+
+    state_file = poll_state_file(notifiers)
+    state = load_poll_state(state_file)
+    now = time.time()
+    streak = state.get("unchanged_streak", 0)
+    # Allow half an interval of slack so a cron run that fires slightly early is not skipped
+    next_poll_at = state.get("next_poll_at", 0)
+    if now < next_poll_at - CONFIG.poll_min / 2:
+        wait = f"Next check due in {next_poll_at - now:.0f}s. Skipping this check."
+        if streak:
+            print(f"Price unchanged for {streak} polls. {wait}")
+        else:
+            print(wait)
+        return next_poll_at - now
+
+    price = check_and_notify(notifiers)
+    if price is not None:
+        streak = streak + 1 if price == state.get("last_price") else 0
+        state["last_price"] = price
+
+    delay = next_poll_delay(streak)
+    state["unchanged_streak"] = streak
+    state["next_poll_at"] = now + delay
+    save_poll_state(state_file, state)
+    return delay
+
+
+def run(notifiers: Sequence[Notifier]) -> None:
+    """
+    Poll once, or keep polling if POLL_INTERVAL is set, backing off while the
+    price is unchanged.
+    """
+    delay = poll(notifiers)
+    while CONFIG.poll_interval > 0:
+        time.sleep(delay)
+        delay = poll(notifiers)
@@ -0,0 +1,58 @@
+import os
+import pathlib
+from dataclasses import dataclass
+from twilio.rest import Client
+from price_core import CONFIG, Notifier, format_price, run
+
+
+@dataclass(frozen=True, slots=True)
+class TwilioConfig:
+    account_sid: str
+    auth_token: str
+    from_number: str
+    to_number: str
+
+    def __post_init__(self):
+        if not (self.account_sid and self.auth_token and self.from_number and self.to_number):
+            raise SystemExit("Twilio settings are missing. Check your .env file.")
+
+
+TWILIO_CONFIG = TwilioConfig(
+    account_sid=os.getenv("TWILIO_ACCOUNT_SID"),
+    auth_token=os.getenv("TWILIO_AUTH_TOKEN"),
+    from_number=os.getenv("TWILIO_FROM_NUMBER"),
+    to_number=os.getenv("TWILIO_TO_NUMBER"),
+)
+
+LAST_PRICE_FILE = pathlib.Path("last_notified_price.txt")
+
+
+def send_sms(message: str) -> None:
+    client = Client(TWILIO_CONFIG.account_sid, TWILIO_CONFIG.auth_token)
+    client.messages.create(
+        body=message,
+        from_=TWILIO_CONFIG.from_number,
+        to=TWILIO_CONFIG.to_number,
+    )
+
+
+def notify_sms(current_price: int) -> None:
+    msg = (
+        f"Apartment price alert!\n"
+        f"Current quote: {format_price(current_price)}\n"
+        f"Threshold: {format_price(CONFIG.price_threshold)}\n"
+        f"URL: {CONFIG.apartment_url}"
+    )
+    print("Sending SMS:", msg)
+    send_sms(msg)
+
+
+NOTIFIER = Notifier(notify_sms, LAST_PRICE_FILE, "SMS")
+
+
+def main():
+    run([NOTIFIER])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+# price_core validates its settings on import
+os.environ.setdefault("APARTMENT_URL", "https://listing.example/floorplan")
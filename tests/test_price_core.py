@@ -0,0 +1,118 @@
+import os
+
+import httpx
+import pytest
+
+import price_core
+
+SPAN = b'<span data-jd-fp-adp="display" class="jd-fp-strong-text">Base Rent $2,671</span>'
+
+
+@pytest.fixture
+def serve(monkeypatch, tmp_path):
+    """Point price_core at an in-memory page instead of the network."""
+    monkeypatch.setattr(price_core, "HTTP_CACHE_FILE", tmp_path / "price_cache.json")
+
+    def _serve(body: bytes):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        monkeypatch.setattr(price_core, "CLIENT", httpx.Client(transport=transport))
+
+    return _serve
+
+
+@pytest.mark.parametrize("cut", [b"$2", b"$2,", b"$2,6", b"$2,67", b"$2,671"])
+def test_amount_split_across_chunks(serve, cut):
+    # Put the end of the first chunk right after `cut`
+    head = SPAN[:SPAN.index(cut) + len(cut)]
+    padding = b" " * (price_core.STREAM_CHUNK_SIZE - len(head))
+    serve(padding + SPAN + b"<p>" + b"x" * 20000 + b"</p>")
+
+    assert price_core.get_current_price() == 267100
+
+
+def test_poll_state_is_separate_per_channel_set(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(price_core, "CONFIG", price_core.Config(
+        apartment_url="https://listing.example/floorplan",
+        price_threshold=300000,
+        poll_interval=0,
+        poll_min=600,
+        poll_max=600,
+    ))
+    sms = price_core.Notifier(lambda price: None, tmp_path / "sms.txt", "SMS")
+    email = price_core.Notifier(lambda price: None, tmp_path / "email.txt", "email")
+    calls = []
+    monkeypatch.setattr(price_core, "check_and_notify", lambda notifiers: calls.append(notifiers) or 267100)
+
+    price_core.poll([sms])
+    price_core.poll([email])
+    price_core.poll([sms])
+
+    # The second SMS poll is inside its own backoff window; the email poll is not
+    assert calls == [[sms], [email]]
+
+
+@pytest.mark.parametrize("span", [
+    SPAN,
+    b'<span class="jd-fp-strong-text" data-jd-fp-adp="display">Base Rent $2,671</span>',
+])
+def test_fast_path_ignores_other_strong_text_spans(serve, span):
+    serve(b'<span class="jd-fp-strong-text">Deposit $500</span>' + span + b"<p>end</p>")
+
+    assert price_core.get_current_price() == 267100
+
+
+@pytest.mark.parametrize("poll_interval, poll_min, poll_max", [
+    (-1, 0, 0),
+    (0, -60, 0),
+    (0, 600, 300),
+])
+def test_config_rejects_bad_poll_settings(poll_interval, poll_min, poll_max):
+    with pytest.raises(SystemExit):
+        price_core.Config(
+            apartment_url="https://listing.example/floorplan",
+            price_threshold=300000,
+            poll_interval=poll_interval,
+            poll_min=poll_min,
+            poll_max=poll_max,
+        )
+
+
+@pytest.fixture
+def state_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(price_core, "_STATE", {})
+    return tmp_path / "last_notified_price.txt"
+
+
+def rewrite(path, content):
+    """Edit the file the way another process would, with a visibly newer mtime."""
+    path.write_text(content)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_external_edit_of_state_file_is_picked_up(state_file):
+    price_core.set_last_notified_price(state_file, 267100)
+    assert price_core.get_last_notified_price(state_file) == 267100
+
+    rewrite(state_file, "199900")
+    assert price_core.get_last_notified_price(state_file) == 199900
+
+    state_file.unlink()
+    assert price_core.get_last_notified_price(state_file) is None
+
+
+def test_just_written_price_wins_over_earlier_file_contents(state_file):
+    rewrite(state_file, "300000")
+    assert price_core.get_last_notified_price(state_file) == 300000
+
+    price_core.set_last_notified_price(state_file, 250000)
+
+    assert price_core.get_last_notified_price(state_file) == 250000
+    assert state_file.read_text() == "250000"
+
+
+def test_legacy_dollar_state_file_is_read_as_cents(state_file):
+    state_file.write_text("2671.0")
+
+    assert price_core.read_last_notified_price(state_file) == 267100